@@ -0,0 +1,111 @@
+from collections import deque
+import numpy as np
+import asyncio
+import time
+
+TIERS = ["model", "rules"]
+
+# Smoothing applied when the model gets faster
+ESTIMATE_ALPHA = 0.2
+# While the estimate alone rules the model out, one probe request per
+# interval still reaches it, so a stale estimate cannot keep the model tier
+# closed and a slow model only overruns the budget once per interval.
+PROBE_INTERVAL = 1.0
+
+
+class AdmissionController:
+    """
+    Caps in-flight model inference and decides per request whether the full
+    model can answer within the caller's latency budget. Requests that are
+    not admitted are scored by the rule table instead of being queued.
+    """
+
+    def __init__(
+        self,
+        max_inflight: int,
+        default_budget_ms: float,
+        window=1000,
+        probe_interval=PROBE_INTERVAL,
+    ):
+        self.max_inflight = max_inflight
+        self.default_budget_ms = default_budget_ms
+        self.probe_interval = probe_interval
+        self._slots = asyncio.Semaphore(max_inflight)
+        self._latencies = {tier: deque(maxlen=window) for tier in TIERS}
+        self._counts = {tier: 0 for tier in TIERS}
+        # Conservative estimate of full-model latency, in seconds
+        self._model_estimate = 0.0
+        self._last_probe = float("-inf")
+
+    async def acquire(self, deadline: float):
+        """
+        Wait for an inference slot only as long as the deadline allows, leaving
+        room for the expected model latency. Returns False to shed the request.
+        """
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return False
+        wait = remaining - self._model_estimate
+        if wait <= 0:
+            return await self._probe()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=wait)
+        except asyncio.TimeoutError:
+            return False
+        # The estimate may have grown while this request was waiting
+        if time.perf_counter() + self._model_estimate > deadline:
+            self._slots.release()
+            return False
+        return True
+
+    async def _probe(self):
+        """
+        Admit at most one request per probe interval, and only into a free
+        slot, so the estimate is refreshed from a real model call.
+        """
+        now = time.perf_counter()
+        if now - self._last_probe < self.probe_interval or self._slots.locked():
+            return False
+        self._last_probe = now
+        await self._slots.acquire()
+        return True
+
+    def release(self):
+        self._slots.release()
+
+    def observe_model(self, elapsed: float):
+        """
+        Update the latency estimate from the model call alone, excluding time
+        spent waiting for a slot. Slower calls raise it at once so admitted
+        requests keep within budget; faster calls lower it gradually.
+        """
+        if elapsed >= self._model_estimate:
+            self._model_estimate = elapsed
+        else:
+            self._model_estimate += ESTIMATE_ALPHA * (elapsed - self._model_estimate)
+
+    def record(self, tier: str, elapsed: float):
+        self._counts[tier] += 1
+        self._latencies[tier].append(elapsed)
+
+    def snapshot(self):
+        total = sum(self._counts.values())
+        tiers = {}
+        for tier in TIERS:
+            latencies = np.array(self._latencies[tier]) * 1000
+            tiers[tier] = {
+                "count": self._counts[tier],
+                "p50_ms": round(float(np.percentile(latencies, 50)), 3)
+                if len(latencies)
+                else None,
+                "p99_ms": round(float(np.percentile(latencies, 99)), 3)
+                if len(latencies)
+                else None,
+            }
+        return {
+            "max_inflight": self.max_inflight,
+            "default_budget_ms": self.default_budget_ms,
+            "total_requests": total,
+            "shed_rate": round(self._counts["rules"] / total, 4) if total else 0.0,
+            "tiers": tiers,
+        }
@@ -0,0 +1,270 @@
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from app.logger import logger
+import argparse
+import hashlib
+import time
+import os
+
+# These features feed training experiments only. The served pipeline
+# receives raw transactions, so retrain_model does not train on them
+# until serving can compute the same features per request.
+
+# Bump when the feature definitions change so stale caches are ignored.
+FEATURE_VERSION = 1
+
+BEHAVIORAL_FEATURES = [
+    "avgDailyVolumeSoFar",
+    "avgDailyVolumeBeforeTxn",
+    "amountToAvgVolumeRatio",
+    "isFirstTransaction",
+    "avgDailyTransactionCount",
+    "avgHourlyTransactionCount",
+    "txnPerHourChange",
+    "txnPerHourChangeNorm",
+]
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(BASE_DIR, "data", "feature_cache")
+
+
+def _per_row(values: pd.Series, starts: pd.Series, block_id: pd.Series):
+    """Broadcast the value taken at each block's first row to the whole block."""
+    return block_id.map(pd.Series(values[starts].to_numpy(), index=block_id[starts]))
+
+
+def _compute_partition(df: pd.DataFrame):
+    """
+    Compute point-in-time behavioral features for every account in ``df``.
+
+    Rows are visited in ``step`` order per ``nameOrig`` and each feature only
+    uses transactions at or before the current row, so nothing from the
+    future leaks into training data.
+    """
+    df = df.sort_values(["nameOrig", "step"], kind="mergesort")
+    account = df["nameOrig"]
+    step = df["step"]
+    day = step // 24
+
+    rownum = df.groupby(account, sort=False).cumcount()
+    is_first = rownum == 0
+
+    # Daily volume features
+    new_day = is_first | day.ne(day.shift())
+    days_seen = new_day.groupby(account, sort=False).cumsum()
+    avg_so_far = df.groupby(account, sort=False)["amount"].cumsum() / days_seen
+    avg_before = avg_so_far.groupby(account, sort=False).shift(1).fillna(0)
+
+    day_id = new_day.cumsum()
+    prior_days = days_seen - 1
+    prior_day_txns = _per_row(rownum, new_day, day_id)
+    avg_daily_count = (prior_day_txns / prior_days.replace(0, np.nan)).fillna(0)
+
+    # Hourly activity features, one step is one hour
+    new_step = is_first | step.ne(step.shift())
+    hour_index = new_step.groupby(account, sort=False).cumsum() - 1
+    step_id = new_step.cumsum()
+    prior_step_txns = _per_row(rownum, new_step, step_id)
+    hourly_count = rownum - prior_step_txns + 1
+    avg_hourly = prior_step_txns / hour_index.replace(0, np.nan)
+
+    # Change is measured against the average as of the previous hour
+    prev_avg_hourly = _per_row(
+        avg_hourly.groupby(account, sort=False).shift(1), new_step, step_id
+    )
+    prev_avg_hourly[hour_index == 0] = 0
+    change = hourly_count - prev_avg_hourly
+
+    out = df.copy()
+    out["avgDailyVolumeSoFar"] = avg_so_far
+    out["avgDailyVolumeBeforeTxn"] = avg_before
+    out["amountToAvgVolumeRatio"] = df["amount"] / (avg_before + 1e-6)
+    out["isFirstTransaction"] = is_first.astype(int)
+    out["avgDailyTransactionCount"] = avg_daily_count
+    out["avgHourlyTransactionCount"] = avg_hourly.fillna(0)
+    out["txnPerHourChange"] = change.fillna(0)
+    out["txnPerHourChangeNorm"] = (change / (prev_avg_hourly + 1e-6)).fillna(0)
+    return out
+
+
+def compute_behavioral_features(
+    df: pd.DataFrame, n_workers: int | None = None, n_partitions: int | None = None
+):
+    """
+    Add the behavioral features from ``notebooks/anomaly_fraud.ipynb`` to
+    ``df``, partitioning accounts by hash of ``nameOrig`` across a process
+    pool. Rows come back in their original order.
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    n_partitions = n_partitions or n_workers
+
+    if n_workers == 1 or n_partitions == 1:
+        return _compute_partition(df).loc[df.index]
+
+    bucket = pd.util.hash_pandas_object(df["nameOrig"], index=False) % n_partitions
+    partitions = [part for _, part in df.groupby(bucket.to_numpy(), sort=False)]
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        results = list(executor.map(_compute_partition, partitions))
+
+    return pd.concat(results).loc[df.index]
+
+
+def _cache_path(data_path: str, cache_dir: str):
+    stat = os.stat(data_path)
+    key = f"{os.path.abspath(data_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(data_path))[0]
+    return os.path.join(cache_dir, f"{name}_v{FEATURE_VERSION}_{digest}.parquet")
+
+
+def backfill_features(
+    data_path: str, cache_dir: str | None = None, n_workers: int | None = None
+):
+    """
+    Load transactions from ``data_path`` with behavioral features attached,
+    reusing a Parquet cache keyed on the file's path, size and mtime.
+    """
+    cache_dir = cache_dir or os.environ.get("FEATURE_CACHE_DIR", DEFAULT_CACHE_DIR)
+    cache_path = _cache_path(data_path, cache_dir)
+    if os.path.exists(cache_path):
+        logger.info(f"Loaded cached features from {cache_path}")
+        return pd.read_parquet(cache_path)
+
+    start_time = time.time()
+    df = pd.read_csv(data_path)
+    df = compute_behavioral_features(df, n_workers=n_workers)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    df.to_parquet(cache_path, index=False)
+    elapsed = round(time.time() - start_time, 2)
+    logger.info(f"Backfilled {len(df)} rows in {elapsed}s -> {cache_path}")
+    return df
+
+
+def notebook_features(df: pd.DataFrame):
+    """
+    Reference implementation following the groupby/merge cells of
+    ``notebooks/anomaly_fraud.ipynb``, used to verify the backfill.
+    """
+    df = df.copy()
+    df["dayOfMonth"] = df["step"] // 24
+
+    daily_sum = (
+        df.groupby(["nameOrig", "dayOfMonth"])["amount"]
+        .sum()
+        .reset_index(name="dailyVolume")
+    )
+    df = df.merge(daily_sum, on=["nameOrig", "dayOfMonth"], how="left")
+    df = df.sort_values(by=["nameOrig", "dayOfMonth"])
+    df["cumulativeVolume"] = df.groupby("nameOrig")["dailyVolume"].cumsum()
+    df["dayCount"] = df.groupby("nameOrig")["dayOfMonth"].cumcount() + 1
+    df["avgDailyVolumeSoFar"] = df["cumulativeVolume"] / df["dayCount"]
+    df["avgDailyVolumeBeforeTxn"] = (
+        df.groupby("nameOrig")["avgDailyVolumeSoFar"].shift(1).fillna(0)
+    )
+    df["amountToAvgVolumeRatio"] = df["amount"] / (
+        df["avgDailyVolumeBeforeTxn"] + 1e-6
+    )
+    df["isFirstTransaction"] = (df.groupby("nameOrig").cumcount() == 0).astype(int)
+
+    daily_counts = (
+        df.groupby(["nameOrig", "dayOfMonth"]).size().reset_index(name="dailyTxnCount")
+    )
+    daily_counts["cumTxn"] = (
+        daily_counts.groupby("nameOrig")["dailyTxnCount"].cumsum().shift(fill_value=0)
+    )
+    daily_counts["dayIndex"] = daily_counts.groupby("nameOrig").cumcount()
+    daily_counts["avgDailyTransactionCount"] = daily_counts["cumTxn"] / daily_counts[
+        "dayIndex"
+    ].replace(0, np.nan)
+    df = df.merge(
+        daily_counts[["nameOrig", "dayOfMonth", "avgDailyTransactionCount"]],
+        on=["nameOrig", "dayOfMonth"],
+        how="left",
+    )
+    df["avgDailyTransactionCount"] = df["avgDailyTransactionCount"].fillna(0)
+
+    df = df.sort_values(["nameOrig", "step"])
+    hourly_counts = (
+        df.groupby(["nameOrig", "step"]).size().reset_index(name="hourlyTxnCount")
+    )
+    hourly_counts["cumTxn"] = (
+        hourly_counts.groupby("nameOrig")["hourlyTxnCount"].cumsum().shift(fill_value=0)
+    )
+    hourly_counts["hourIndex"] = hourly_counts.groupby("nameOrig").cumcount()
+    hourly_counts["avgHourlyTransactionCount"] = hourly_counts[
+        "cumTxn"
+    ] / hourly_counts["hourIndex"].replace(0, np.nan)
+    prev_avg = hourly_counts.groupby("nameOrig")["avgHourlyTransactionCount"].shift(
+        fill_value=0
+    )
+    hourly_counts["txnPerHourChange"] = hourly_counts["hourlyTxnCount"] - prev_avg
+    hourly_counts["txnPerHourChangeNorm"] = hourly_counts["txnPerHourChange"] / (
+        prev_avg + 1e-6
+    )
+    hourly_cols = [
+        "avgHourlyTransactionCount",
+        "txnPerHourChange",
+        "txnPerHourChangeNorm",
+    ]
+    df = df.merge(
+        hourly_counts[["nameOrig", "step"] + hourly_cols],
+        on=["nameOrig", "step"],
+        how="left",
+    )
+    df[hourly_cols] = df[hourly_cols].fillna(0)
+    return df
+
+
+def verify_against_notebook(
+    df: pd.DataFrame, n_accounts: int = 1000, random_state: int = 42
+):
+    """
+    Compare the backfill with the notebook on a sample of accounts and return
+    the largest absolute difference per feature.
+
+    The notebook sums whole days and hours before merging them back, so it
+    sees later same-day transactions. Only accounts with at most one
+    transaction per day are compared, where both definitions agree; the
+    same-day and same-hour logic is covered by the point-in-time tests.
+    """
+    df = df.drop(columns=BEHAVIORAL_FEATURES, errors="ignore")
+    day = df["step"] // 24
+    per_day = df.groupby([df["nameOrig"], day]).size().groupby(level=0).max()
+    eligible = per_day.index[per_day == 1].to_series()
+    if eligible.empty:
+        raise ValueError("No accounts with at most one transaction per day")
+    accounts = eligible.sample(
+        min(n_accounts, len(eligible)), random_state=random_state
+    )
+    sample = df[df["nameOrig"].isin(accounts)].reset_index(drop=True)
+    sample["_row"] = sample.index
+
+    ours = compute_behavioral_features(sample, n_workers=1).set_index("_row")
+    theirs = notebook_features(sample).set_index("_row").loc[ours.index]
+    diffs = (ours[BEHAVIORAL_FEATURES] - theirs[BEHAVIORAL_FEATURES]).abs().max()
+    return diffs.to_dict()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Backfill point-in-time behavioral features for training."
+    )
+    parser.add_argument("data_path", help="CSV of raw PaySim transactions")
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--verify-accounts",
+        type=int,
+        default=0,
+        help="Compare against the notebook on this many sampled accounts",
+    )
+    args = parser.parse_args()
+
+    features = backfill_features(args.data_path, args.cache_dir, args.workers)
+    if args.verify_accounts:
+        diffs = verify_against_notebook(features, n_accounts=args.verify_accounts)
+        for name, diff in diffs.items():
+            logger.info(f"{name}: max abs diff {diff:.3e}")
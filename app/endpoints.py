@@ -1,12 +1,23 @@
-from fastapi import APIRouter, Request, HTTPException, UploadFile, File, status
-from celery.result import AsyncResult
-from app.worker import celery_app
+from fastapi import (
+    APIRouter,
+    Request,
+    HTTPException,
+    UploadFile,
+    File,
+    Header,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
 from app.models import (
     Transaction,
     FraudPredictionResponse,
     TriggerRetrainResponse,
     RetrainStatusResponse,
+    ReadinessResponse,
+    AdmissionMetricsResponse,
 )
+from app.rules import score_rules
+from app.preprocess import transactions_to_frame
 from app.logger import logger
 import pandas as pd
 import time
@@ -17,46 +28,158 @@ import shutil
 router = APIRouter()
 
 
+def get_celery_app():
+    """
+    Import the Celery app on first use so API startup does not pay for
+    building the Redis-backed client.
+    """
+    from app.worker import celery_app
+
+    return celery_app
+
+
 @router.get("/")
 def home():
     return {"message": "Fraud detection API is running."}
 
 
+@router.get(
+    "/health/live",
+    summary="Liveness probe",
+    description="""Returns 200 as soon as the server process is accepting
+                    requests, 503 if model startup failed.""",
+)
+def liveness(request: Request):
+    startup_error = request.app.state.startup_error
+    if startup_error:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Model startup failed: {startup_error}",
+        )
+    return {"status": "alive"}
+
+
+@router.get(
+    "/health/ready",
+    summary="Readiness probe",
+    description="""Returns 200 once the model is loaded and warmed up,
+                    503 until then.""",
+    response_model=ReadinessResponse,
+)
+def readiness(request: Request):
+    startup_error = request.app.state.startup_error
+    if startup_error:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Model startup failed: {startup_error}",
+        )
+    if not request.app.state.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Model is still loading",
+        )
+    return ReadinessResponse(
+        status="ready", startup_timings=request.app.state.startup_timings
+    )
+
+
+def score_model(model, df: pd.DataFrame):
+    prediction = model.predict(df)[0]
+    prob = model.predict_proba(df)[0][1]
+    return bool(prediction), float(prob)
+
+
 @router.post(
     "/predict/",
     summary="Predict fraud",
     description="""This endpoint takes transaction data and predicts whether
-                    it is fraudulent.""",
+                    it is fraudulent. When the model cannot answer within the
+                    latency budget, the rule table scores the transaction.""",
     response_model=FraudPredictionResponse,
 )
-def predict(request: Request, input_data: Transaction):
+async def predict(
+    request: Request,
+    input_data: Transaction,
+    latency_budget_ms: float | None = Header(None, alias="X-Latency-Budget-Ms"),
+):
     """
     ### Predict Fraud
     - **transaction**: JSON object containing transaction details
+    - **X-Latency-Budget-Ms**: optional header overriding the default budget
     - **Returns**: {
         prediction: bool
         fraud_probability: float
+        tier: "model" or "rules"
     }
     """
+    if not request.app.state.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Model is still loading",
+        )
+
     start_time = time.time()
-    model = request.app.state.model
-    df = pd.DataFrame([input_data.dict()])
-    prediction = model.predict(df)[0]
-    prob = model.predict_proba(df)[0][1]
+    started = time.perf_counter()
+    admission = request.app.state.admission
+    budget_ms = latency_budget_ms
+    if budget_ms is None:
+        budget_ms = admission.default_budget_ms
+    df = transactions_to_frame([input_data])
+
+    if await admission.acquire(started + budget_ms / 1000):
+        try:
+            scoring_started = time.perf_counter()
+            prediction, prob = await run_in_threadpool(
+                score_model, request.app.state.model, df
+            )
+            admission.observe_model(time.perf_counter() - scoring_started)
+        finally:
+            admission.release()
+        tier = "model"
+    else:
+        prob = float(score_rules(df)[0])
+        prediction = prob >= 0.5
+        tier = "rules"
+
+    admission.record(tier, time.perf_counter() - started)
     elapsed = round(time.time() - start_time, 3)
 
+    # Claim the first prediction before logging so concurrent requests
+    # cannot both report it.
+    first_prediction = not request.app.state.first_prediction_served
+    request.app.state.first_prediction_served = True
+
     logger.info(
         f"""Prediction completed in {elapsed}s
-        | Fraud Probability: {prob:.4f} | Prediction: {bool(prediction)}"""
+        | Fraud Probability: {prob:.4f} | Prediction: {bool(prediction)}
+        | Tier: {tier}"""
     )
 
+    if first_prediction:
+        ready_after = request.app.state.startup_timings["total"]
+        logger.info(
+            f"First prediction served in {elapsed}s (model ready after {ready_after}s)"
+        )
+
     return FraudPredictionResponse(
         prediction=bool(prediction),
         fraud_probability=float(round(prob, 4)),
         processing_time=elapsed,
+        tier=tier,
     )
 
 
+@router.get(
+    "/metrics/admission",
+    summary="Admission control metrics",
+    description="""Shed rate and per-tier latency percentiles over the most
+                    recent predictions.""",
+    response_model=AdmissionMetricsResponse,
+)
+def admission_metrics(request: Request):
+    return AdmissionMetricsResponse(**request.app.state.admission.snapshot())
+
+
 @router.post(
     "/retrain/",
     summary="Trigger model retraining",
@@ -84,7 +207,7 @@ async def retrain(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail="Failed to save uploaded file")
 
     # Start Celery task
-    task = celery_app.send_task("app.tasks.retrain_model", args=[file_path])
+    task = get_celery_app().send_task("app.tasks.retrain_model", args=[file_path])
     return TriggerRetrainResponse(
         status_code=202, message="Retraining started", task_id=task.id
     )
@@ -100,7 +223,9 @@ def get_retraining_status(task_id: str):
     """
     Check the retraining task status.
     """
-    task_result = AsyncResult(task_id, app=celery_app)
+    from celery.result import AsyncResult
+
+    task_result = AsyncResult(task_id, app=get_celery_app())
     if task_result.state == "PENDING":
         return RetrainStatusResponse(task_id=task_id, status="Pending")
     elif task_result.state == "STARTED":
@@ -1,15 +1,71 @@
+import time
+
+IMPORT_START = time.perf_counter()
+
 from fastapi import FastAPI
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager
 from app.endpoints import router
 from app.logger import logger
-import joblib
-import time
+from app.startup import load_model, warm_up
+from app.admission import AdmissionController
+import asyncio
 import os
 
+IMPORT_ELAPSED = time.perf_counter() - IMPORT_START
+
 # Load .env
 load_dotenv()
 
 
+def prepare_model(app: FastAPI):
+    """
+    Load and warm up the model, then mark the app ready for traffic. A
+    failure is recorded on the app state so the liveness probe fails and
+    the platform restarts the service.
+    """
+    try:
+        model, load_elapsed = load_model()
+        warmup_elapsed = warm_up(model)
+    except Exception as e:
+        app.state.startup_error = str(e)
+        logger.error(f"❌ Model startup failed: {e}")
+        return
+    app.state.model = model
+    app.state.startup_timings = {
+        "imports": round(IMPORT_ELAPSED, 3),
+        "model_load": round(load_elapsed, 3),
+        "warmup": round(warmup_elapsed, 3),
+        "total": round(time.perf_counter() - IMPORT_START, 3),
+    }
+    app.state.ready = True
+    timings = app.state.startup_timings
+    logger.info(
+        f"""✅ Model ready in {timings['total']}s
+        | Imports: {timings['imports']}s | Model load: {timings['model_load']}s
+        | Warm-up: {timings['warmup']}s"""
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.model = None
+    app.state.ready = False
+    app.state.startup_error = None
+    app.state.startup_timings = {}
+    app.state.first_prediction_served = False
+    app.state.admission = AdmissionController(
+        max_inflight=int(os.environ.get("MAX_INFLIGHT_PREDICTIONS", "4")),
+        default_budget_ms=float(os.environ.get("LATENCY_BUDGET_MS", "200")),
+    )
+
+    # Load the model off the event loop so liveness probes are answered
+    # while the pipeline is still being unpickled and warmed up.
+    loader = asyncio.create_task(asyncio.to_thread(prepare_model, app))
+    yield
+    loader.cancel()
+
+
 app = FastAPI(
     title="Online Fraud Detection API",
     description="""This API detects fraudulent transactions
@@ -20,17 +76,8 @@ app = FastAPI(
         "email": "larindeakin@gmail.com",
     },
     license_info={"name": "MIT", "url": "https://opensource.org/licenses/MIT"},
+    lifespan=lifespan,
 )
 
 
-@app.on_event("startup")
-def load_model():
-    start_time = time.time()
-    model_name = os.environ.get("MODEL_NAME")
-    MODEL_PATH = os.path.join(os.path.dirname(__file__), f"../model/{model_name}")
-    app.state.model = joblib.load(MODEL_PATH)
-    elapsed = round(time.time() - start_time, 2)
-    logger.info(f"✅ Model loaded successfully in {elapsed}s")
-
-
 app.include_router(router)
@@ -0,0 +1,195 @@
+from joblib import Parallel, delayed
+import joblib
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.metrics import average_precision_score, precision_recall_curve
+from sklearn.model_selection import ParameterSampler
+from xgboost.callback import TrainingCallback
+import numpy as np
+import tempfile
+import shutil
+import time
+import os
+
+SEARCH_SPACE = {
+    "max_depth": [3, 4, 5, 6, 8],
+    "learning_rate": [0.03, 0.05, 0.1, 0.2],
+    "scale_pos_weight": [1, 5, 20, 50, 100],
+    "min_child_weight": [1, 5, 10],
+    "subsample": [0.7, 0.85, 1.0],
+    "colsample_bytree": [0.7, 0.85, 1.0],
+}
+
+# Successive halving: every round keeps the top 1/ETA candidates and
+# multiplies their boosting rounds by ETA.
+ETA = 3
+MIN_ESTIMATORS = 50
+MAX_ESTIMATORS = 1350
+EARLY_STOPPING_ROUNDS = 20
+
+# Threshold targets from notebooks/anomaly_fraud.ipynb: T_high is the first
+# threshold reaching 0.90 precision, and T_low was picked from the PR table
+# filtered to recall >= 0.60 and precision >= 0.50. The precision floor keeps
+# the review queue from flooding, so it is kept as a deliberate choice.
+REVIEW_MIN_PRECISION = 0.50
+REVIEW_MIN_RECALL = 0.60
+BLOCK_MIN_PRECISION = 0.90
+
+
+class Deadline(TrainingCallback):
+    """Stop boosting once the search's wall-clock deadline has passed."""
+
+    def __init__(self, deadline: float):
+        super().__init__()
+        self.deadline = deadline
+
+    def after_iteration(self, model, epoch, evals_log):
+        return time.time() >= self.deadline
+
+
+def to_dense(X):
+    return X.toarray() if sparse.issparse(X) else X
+
+
+def _memmap(array, folder: str, name: str):
+    """Dump ``array`` once and reopen it read-only as a memory map."""
+    path = os.path.join(folder, f"{name}.joblib")
+    joblib.dump(np.asarray(array), path)
+    return joblib.load(path, mmap_mode="r")
+
+
+def _run_trial(
+    estimator, params, n_estimators, X_train, y_train, X_val, y_val, deadline
+):
+    """Fit one candidate with early stopping and score it by AUPRC."""
+    if time.time() >= deadline:
+        return None
+    model = clone(estimator).set_params(
+        **params,
+        n_estimators=n_estimators,
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        eval_metric="aucpr",
+        callbacks=[Deadline(deadline)],
+        n_jobs=1,
+    )
+    model.fit(X_train, y_train, eval_set=[(X_val, y_val)], verbose=False)
+    score = average_precision_score(y_val, model.predict_proba(X_val)[:, 1])
+    return score, model
+
+
+def select_model(
+    estimator,
+    X_train,
+    y_train,
+    X_val,
+    y_val,
+    time_budget: float,
+    n_candidates: int = 27,
+    n_jobs: int = -1,
+    random_state: int = 42,
+):
+    """
+    Successive-halving search over ``SEARCH_SPACE`` within ``time_budget``
+    seconds, selecting by validation AUPRC.
+
+    Trials run on the loky backend, which works inside Celery's daemonic
+    workers, and every trial reads the same memory-mapped copy of the
+    prepared dataset. Boosting stops at the deadline, so the search
+    overruns the budget by at most one boosting round per trial.
+
+    Returns the best model, its params and score, and the number of
+    completed trials. The model has its search-only settings cleared so it
+    can be refitted without an ``eval_set``.
+    """
+    deadline = time.time() + time_budget
+    candidates = list(
+        ParameterSampler(SEARCH_SPACE, n_iter=n_candidates, random_state=random_state)
+    )
+    n_estimators = MIN_ESTIMATORS
+    best = None
+    trials = 0
+
+    # The prepared arrays are memory-mapped once up front. Workers open the
+    # same files instead of receiving copies, and dispatching a trial only
+    # sends a file reference.
+    folder = tempfile.mkdtemp(prefix="fraud_search_")
+    try:
+        X_train, y_train, X_val, y_val = (
+            _memmap(array, folder, name)
+            for array, name in [
+                (X_train, "X_train"),
+                (y_train, "y_train"),
+                (X_val, "X_val"),
+                (y_val, "y_val"),
+            ]
+        )
+
+        # loky keeps its workers alive between calls, so rounds reuse them and
+        # the search does not wait for a pool shutdown at the end.
+        parallel = Parallel(n_jobs=n_jobs, backend="loky", max_nbytes="1M")
+        while candidates and time.time() < deadline:
+            results = parallel(
+                delayed(_run_trial)(
+                    estimator,
+                    params,
+                    n_estimators,
+                    X_train,
+                    y_train,
+                    X_val,
+                    y_val,
+                    deadline,
+                )
+                for params in candidates
+            )
+            scored = [
+                (result[0], params, result[1])
+                for params, result in zip(candidates, results)
+                if result is not None
+            ]
+            if not scored:
+                break
+            trials += len(scored)
+            scored.sort(key=lambda trial: trial[0], reverse=True)
+            # The deadline can cut a round's trials short, so a later round
+            # only replaces the best model when it actually scores higher.
+            if best is None or scored[0][0] > best[0]:
+                best = scored[0]
+            if len(scored) == 1 or n_estimators >= MAX_ESTIMATORS:
+                break
+            survivors = scored[: max(1, len(scored) // ETA)]
+            candidates = [params for _, params, _ in survivors]
+            n_estimators = min(n_estimators * ETA, MAX_ESTIMATORS)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    if best is None:
+        raise TimeoutError("Time budget exhausted before any trial completed")
+
+    score, params, model = best
+    model.set_params(
+        early_stopping_rounds=None, eval_metric=None, callbacks=None, n_jobs=None
+    )
+    return {"model": model, "params": params, "auprc": score, "trials": trials}
+
+
+def calibrate_thresholds(y_true, proba):
+    """
+    Pick the review threshold (T_LOW) and block threshold (T_HIGH) from the
+    precision-recall curve, following the targets used in the notebook.
+    """
+    precision, recall, thresholds = precision_recall_curve(y_true, proba)
+    precision, recall = precision[:-1], recall[:-1]
+
+    review = (precision >= REVIEW_MIN_PRECISION) & (recall >= REVIEW_MIN_RECALL)
+    if review.any():
+        t_low = thresholds[review][np.argmax(recall[review])]
+    else:
+        f1 = 2 * precision * recall / np.maximum(precision + recall, 1e-12)
+        t_low = thresholds[np.argmax(f1)]
+
+    block = precision >= BLOCK_MIN_PRECISION
+    if block.any():
+        t_high = thresholds[block].min()
+    else:
+        t_high = thresholds[np.argmax(precision)]
+    return float(t_low), float(max(t_high, t_low))
@@ -12,11 +12,27 @@ class Transaction(BaseModel):
     oldbalanceDest: float
     newbalanceDest: float
 
+    class Config:
+        schema_extra = {
+            "example": {
+                "step": 1,
+                "type": "TRANSFER",
+                "amount": 9839.64,
+                "nameOrig": "C1231006815",
+                "oldbalanceOrg": 170136.0,
+                "newbalanceOrig": 160296.36,
+                "nameDest": "M1979787155",
+                "oldbalanceDest": 0.0,
+                "newbalanceDest": 0.0,
+            }
+        }
+
 
 class FraudPredictionResponse(BaseModel):
     prediction: bool
     fraud_probability: float
     processing_time: float
+    tier: str  # "model" for the full pipeline, "rules" when shed
 
     class Config:
         schema_extra = {
@@ -24,6 +40,47 @@ class FraudPredictionResponse(BaseModel):
                 "prediction": True,
                 "fraud_probability": 0.8734,
                 "processing_time": 0.024,
+                "tier": "model",
+            }
+        }
+
+
+class AdmissionMetricsResponse(BaseModel):
+    max_inflight: int
+    default_budget_ms: float
+    total_requests: int
+    shed_rate: float
+    tiers: dict
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "max_inflight": 4,
+                "default_budget_ms": 200.0,
+                "total_requests": 1200,
+                "shed_rate": 0.125,
+                "tiers": {
+                    "model": {"count": 1050, "p50_ms": 18.2, "p99_ms": 143.7},
+                    "rules": {"count": 150, "p50_ms": 0.9, "p99_ms": 2.4},
+                },
+            }
+        }
+
+
+class ReadinessResponse(BaseModel):
+    status: str
+    startup_timings: dict
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "status": "ready",
+                "startup_timings": {
+                    "imports": 1.214,
+                    "model_load": 0.402,
+                    "warmup": 0.087,
+                    "total": 1.731,
+                },
             }
         }
 
@@ -64,8 +121,15 @@ class RetrainStatusResponse(BaseModel):
                 "result": {
                     "status": "Model retrained successfully",
                     "data_size": 10000,
-                    "validation_score": 0.95,
+                    "validation_score": 0.81,
+                    "metrics": {
+                        "val_auprc": 0.83,
+                        "test_auprc": 0.81,
+                        "test_roc_auc": 0.99,
+                    },
+                    "thresholds": {"T_LOW": 0.316, "T_HIGH": 0.85},
                     "model_path": "model/fraud_model_pipeline.pkl",
+                    "manifest_path": "model/fraud_model_pipeline.json",
                 },
             }
         }
@@ -43,3 +43,8 @@ class FeatureEngineer(BaseEstimator, TransformerMixin):
             )
             X = X.drop(["timestamp"], axis=1)
         return X
+
+
+def transactions_to_frame(transactions):
+    """Build the model input frame from validated ``Transaction`` objects."""
+    return pd.DataFrame([transaction.dict() for transaction in transactions])
@@ -0,0 +1,35 @@
+import pandas as pd
+import numpy as np
+
+
+# Degraded-mode rule table, evaluated top to bottom; the first matching rule
+# sets the fraud probability. Fraud in PaySim only occurs on TRANSFER and
+# CASH_OUT, typically draining the sender into an account whose balance
+# is never updated.
+RULE_TABLE = [
+    ("safe_type", lambda df: ~df["type"].isin(["TRANSFER", "CASH_OUT"]), 0.0),
+    (
+        "drain_to_unchanged_dest",
+        lambda df: _drains_sender(df) & _dest_unchanged(df),
+        0.95,
+    ),
+    ("drains_sender", lambda df: _drains_sender(df), 0.7),
+    ("large_transfer", lambda df: df["amount"] > 200000, 0.4),
+    ("dest_unchanged", lambda df: _dest_unchanged(df), 0.3),
+]
+DEFAULT_PROBABILITY = 0.05
+
+
+def _drains_sender(df: pd.DataFrame):
+    return (df["oldbalanceOrg"] > 0) & (df["amount"] >= df["oldbalanceOrg"])
+
+
+def _dest_unchanged(df: pd.DataFrame):
+    return (df["oldbalanceDest"] == 0) & (df["newbalanceDest"] == 0)
+
+
+def score_rules(df: pd.DataFrame):
+    """Return a fraud probability per row from the rule table."""
+    conditions = [rule(df).to_numpy() for _, rule, _ in RULE_TABLE]
+    probabilities = [probability for _, _, probability in RULE_TABLE]
+    return np.select(conditions, probabilities, default=DEFAULT_PROBABILITY)
@@ -0,0 +1,47 @@
+from app.models import Transaction
+from app.preprocess import transactions_to_frame
+import joblib
+import time
+import os
+
+
+# Every PaySim type, so the warm-up pass exercises each branch of the
+# pipeline before real traffic arrives.
+WARMUP_TYPES = ["PAYMENT", "TRANSFER", "CASH_OUT", "DEBIT", "CASH_IN"]
+
+
+def build_warmup_frame():
+    """
+    Build warm-up rows from the ``Transaction`` schema example, going through
+    the same validation and frame conversion as ``/predict/``.
+    """
+    example = Transaction.Config.schema_extra["example"]
+    transactions = [
+        Transaction(**{**example, "step": step, "type": txn_type})
+        for step, txn_type in enumerate(WARMUP_TYPES, start=1)
+    ]
+    return transactions_to_frame(transactions)
+
+
+def get_model_path():
+    model_name = os.environ.get("MODEL_NAME")
+    return os.path.join(os.path.dirname(__file__), f"../model/{model_name}")
+
+
+def load_model():
+    """Load the fraud pipeline and return it with its load time."""
+    start_time = time.perf_counter()
+    model = joblib.load(get_model_path())
+    return model, time.perf_counter() - start_time
+
+
+def warm_up(model):
+    """
+    Run one inference on synthetic rows so sklearn/xgboost finish their
+    lazy initialization before the service reports ready.
+    """
+    start_time = time.perf_counter()
+    df = build_warmup_frame()
+    model.predict(df)
+    model.predict_proba(df)
+    return time.perf_counter() - start_time
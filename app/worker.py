@@ -15,9 +15,9 @@ celery_app = Celery(
     include=["app.tasks"],
 )
 
-# Log directory
-os.makedirs("logs", exist_ok=True)
-LOG_FILE = "logs/celery.log"
+# Log directory, created when Celery sets up its loggers
+LOG_DIR = "logs"
+LOG_FILE = os.path.join(LOG_DIR, "celery.log")
 
 
 def setup_json_logger(logger):
@@ -28,6 +28,7 @@ def setup_json_logger(logger):
     )
     for handler in logger.handlers:
         handler.setFormatter(formatter)
+    os.makedirs(LOG_DIR, exist_ok=True)
     file_handler = logging.FileHandler(LOG_FILE)
     file_handler.setFormatter(formatter)
     logger.addHandler(file_handler)
@@ -0,0 +1,14 @@
+import pytest
+from fastapi.testclient import TestClient
+import app.main as main
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    """Start the app through its lifespan with ``load_model`` patched."""
+
+    def factory(loader):
+        monkeypatch.setattr(main, "load_model", loader)
+        return TestClient(main.app)
+
+    return factory
@@ -0,0 +1,29 @@
+import numpy as np
+import time
+from app.models import Transaction
+
+TRANSACTION = Transaction.Config.schema_extra["example"]
+
+
+class StubModel:
+    """Stands in for the fraud pipeline, optionally taking ``delay`` seconds."""
+
+    def __init__(self, delay=0.0, proba=0.1):
+        self.delay = delay
+        self.proba = proba
+
+    def predict(self, df):
+        return np.zeros(len(df), dtype=int)
+
+    def predict_proba(self, df):
+        time.sleep(self.delay)
+        return np.tile([1 - self.proba, self.proba], (len(df), 1))
+
+
+def wait_until_ready(client, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if client.get("/health/ready").status_code == 200:
+            return
+        time.sleep(0.01)
+    raise TimeoutError("Service did not become ready")
@@ -0,0 +1,107 @@
+import asyncio
+import httpx
+import numpy as np
+import time
+import app.main as main
+from app.admission import AdmissionController
+from tests.helpers import StubModel, TRANSACTION
+
+MAX_INFLIGHT = 4
+BUDGET_MS = 200
+MODEL_DELAY = 0.08
+
+
+def serve(model):
+    """Put the app in its ready state without running the lifespan."""
+    main.app.state.model = model
+    main.app.state.ready = True
+    main.app.state.startup_error = None
+    main.app.state.startup_timings = {"total": 0.0}
+    main.app.state.first_prediction_served = False
+    main.app.state.admission = AdmissionController(MAX_INFLIGHT, BUDGET_MS)
+    transport = httpx.ASGITransport(app=main.app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+async def timed_predict(client, headers=None):
+    start = time.perf_counter()
+    response = await client.post("/predict/", json=TRANSACTION, headers=headers)
+    return time.perf_counter() - start, response
+
+
+def test_p99_stays_bounded_under_overload():
+    async def scenario():
+        async with serve(StubModel(delay=MODEL_DELAY)) as client:
+
+            async def caller():
+                return [await timed_predict(client) for _ in range(8)]
+
+            # 3x the concurrency limit, closed loop
+            batches = await asyncio.gather(
+                *[caller() for _ in range(3 * MAX_INFLIGHT)]
+            )
+            overload = [result for batch in batches for result in batch]
+
+            # Once the spike is over, the model tier takes traffic again
+            recovery = [await timed_predict(client) for _ in range(5)]
+            metrics = (await client.get("/metrics/admission")).json()
+        return overload, recovery, metrics
+
+    overload, recovery, metrics = asyncio.run(scenario())
+
+    latencies = np.array([elapsed for elapsed, _ in overload])
+    tiers = [response.json()["tier"] for _, response in overload]
+    assert all(response.status_code == 200 for _, response in overload)
+    assert np.percentile(latencies, 99) < 1.25 * BUDGET_MS / 1000
+    assert 0 < tiers.count("rules") < len(tiers)
+    assert [response.json()["tier"] for _, response in recovery] == ["model"] * 5
+    assert 0 < metrics["shed_rate"] < 1
+    assert metrics["tiers"]["rules"]["p99_ms"] < metrics["tiers"]["model"]["p99_ms"]
+
+
+async def count_admitted(admission, n_requests, budget_ms, spacing=0.0):
+    admitted = 0
+    for _ in range(n_requests):
+        if await admission.acquire(time.perf_counter() + budget_ms / 1000):
+            admission.release()
+            admitted += 1
+        await asyncio.sleep(spacing)
+    return admitted
+
+
+def test_slow_model_estimate_does_not_shed_forever():
+    admission = AdmissionController(MAX_INFLIGHT, BUDGET_MS, probe_interval=0.05)
+    admission.observe_model(1.2)
+
+    # 20 requests spread over about 0.2s, a few probe intervals
+    assert asyncio.run(count_admitted(admission, 20, BUDGET_MS, spacing=0.01)) > 0
+
+
+def test_model_slower_than_budget_is_rarely_admitted():
+    admission = AdmissionController(MAX_INFLIGHT, BUDGET_MS)
+    admission.observe_model(0.15)
+
+    # Shedding is paced by time, not by how many requests were shed
+    assert asyncio.run(count_admitted(admission, 100, budget_ms=100)) <= 1
+
+
+def test_queue_wait_is_not_counted_as_model_latency():
+    async def scenario():
+        async with serve(StubModel(delay=0.05)) as client:
+            await asyncio.gather(*[timed_predict(client) for _ in range(8)])
+            return main.app.state.admission._model_estimate
+
+    assert asyncio.run(scenario()) < 0.1
+
+
+def test_zero_budget_goes_to_rules():
+    async def scenario():
+        async with serve(StubModel()) as client:
+            _, response = await timed_predict(
+                client, headers={"X-Latency-Budget-Ms": "0"}
+            )
+        return response
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert response.json()["tier"] == "rules"
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.backfill import (
+    BEHAVIORAL_FEATURES,
+    backfill_features,
+    compute_behavioral_features,
+    verify_against_notebook,
+)
+
+
+def make_transactions(n_accounts=12, n_rows=400, seed=0):
+    """Accounts with repeated transactions in the same hour and day."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "step": rng.integers(1, 72, n_rows),
+            "type": rng.choice(["TRANSFER", "CASH_OUT", "PAYMENT"], n_rows),
+            "amount": rng.uniform(1, 5000, n_rows).round(2),
+            "nameOrig": rng.choice([f"C{i}" for i in range(n_accounts)], n_rows),
+            "isFraud": rng.integers(0, 2, n_rows),
+        }
+    )
+
+
+def point_in_time_reference(df):
+    """Row-by-row reference that only looks at each account's past rows."""
+    rows = {}
+    order = df.sort_values(["nameOrig", "step"], kind="mergesort")
+    for _, account in order.groupby("nameOrig", sort=False):
+        history = []
+        prev_avg_so_far = 0.0
+        for index, row in account.iterrows():
+            history.append(row)
+            steps = np.array([r["step"] for r in history])
+            days = steps // 24
+            amounts = np.array([r["amount"] for r in history])
+            step, day = row["step"], row["step"] // 24
+
+            avg_so_far = amounts.sum() / len(set(days))
+            prior_days = set(days[days < day])
+            avg_daily_count = (days < day).sum() / len(prior_days) if prior_days else 0
+
+            def avg_hourly_before(s):
+                prior_steps = set(steps[steps < s])
+                if not prior_steps:
+                    return np.nan
+                return (steps < s).sum() / len(prior_steps)
+
+            earlier_steps = sorted(set(steps[steps < step]))
+            if not earlier_steps:
+                prev_avg = 0.0
+            else:
+                prev_avg = avg_hourly_before(earlier_steps[-1])
+            change = (steps == step).sum() - prev_avg
+
+            rows[index] = {
+                "avgDailyVolumeSoFar": avg_so_far,
+                "avgDailyVolumeBeforeTxn": prev_avg_so_far,
+                "amountToAvgVolumeRatio": row["amount"] / (prev_avg_so_far + 1e-6),
+                "isFirstTransaction": int(len(history) == 1),
+                "avgDailyTransactionCount": avg_daily_count,
+                "avgHourlyTransactionCount": np.nan_to_num(avg_hourly_before(step)),
+                "txnPerHourChange": np.nan_to_num(change),
+                "txnPerHourChangeNorm": np.nan_to_num(change / (prev_avg + 1e-6)),
+            }
+            prev_avg_so_far = avg_so_far
+    return pd.DataFrame.from_dict(rows, orient="index").loc[df.index]
+
+
+def test_matches_point_in_time_reference():
+    df = make_transactions()
+    assert df.groupby(["nameOrig", "step"]).size().max() > 1
+
+    ours = compute_behavioral_features(df, n_workers=1)
+    expected = point_in_time_reference(df)
+
+    pd.testing.assert_frame_equal(
+        ours[BEHAVIORAL_FEATURES], expected[BEHAVIORAL_FEATURES], check_dtype=False
+    )
+
+
+def test_process_pool_matches_single_worker():
+    df = make_transactions(n_accounts=40, n_rows=2000, seed=1)
+
+    single = compute_behavioral_features(df, n_workers=1)
+    pooled = compute_behavioral_features(df, n_workers=2, n_partitions=5)
+
+    assert pooled.index.equals(df.index)
+    pd.testing.assert_frame_equal(pooled, single)
+
+
+def test_future_rows_do_not_change_features():
+    df = make_transactions()
+    past = df[df["step"] < 48]
+
+    full = compute_behavioral_features(df, n_workers=1).loc[past.index]
+    truncated = compute_behavioral_features(past, n_workers=1)
+
+    pd.testing.assert_frame_equal(
+        full[BEHAVIORAL_FEATURES], truncated[BEHAVIORAL_FEATURES]
+    )
+
+
+def test_verify_against_notebook_on_single_daily_transactions():
+    df = make_transactions(n_accounts=30, n_rows=60, seed=2)
+    df["step"] = df.groupby("nameOrig").cumcount() * 24 + 5
+
+    diffs = verify_against_notebook(df, n_accounts=10)
+
+    assert set(diffs) == set(BEHAVIORAL_FEATURES)
+    assert max(diffs.values()) < 1e-9
+
+
+def test_verify_against_notebook_without_eligible_accounts():
+    df = pd.DataFrame(
+        {"step": [1, 2], "amount": [10.0, 20.0], "nameOrig": ["C1", "C1"]}
+    )
+    with pytest.raises(ValueError):
+        verify_against_notebook(df)
+
+
+def test_backfill_caches_parquet(tmp_path):
+    data_path = tmp_path / "transactions.csv"
+    make_transactions().to_csv(data_path, index=False)
+    cache_dir = tmp_path / "cache"
+
+    first = backfill_features(str(data_path), str(cache_dir), n_workers=1)
+    assert len(list(cache_dir.glob("*.parquet"))) == 1
+
+    second = backfill_features(str(data_path), str(cache_dir), n_workers=1)
+    pd.testing.assert_frame_equal(first.reset_index(drop=True), second)
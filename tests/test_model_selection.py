@@ -0,0 +1,110 @@
+import numpy as np
+import time
+from sklearn.datasets import make_classification
+from sklearn.metrics import precision_score, recall_score
+from xgboost import XGBClassifier
+import app.model_selection as model_selection
+from app.model_selection import calibrate_thresholds, select_model
+
+
+def make_dataset(n_samples=4000, seed=0):
+    X, y = make_classification(
+        n_samples=n_samples,
+        n_features=10,
+        weights=[0.97],
+        flip_y=0.01,
+        random_state=seed,
+    )
+    cutoff = int(0.75 * n_samples)
+    return X[:cutoff], y[:cutoff], X[cutoff:], y[cutoff:]
+
+
+def test_trials_stop_at_the_deadline(monkeypatch):
+    # Trials long enough that only the deadline can end them
+    monkeypatch.setattr(model_selection, "MIN_ESTIMATORS", 100000)
+    monkeypatch.setattr(model_selection, "EARLY_STOPPING_ROUNDS", 100000)
+    X_train, y_train, X_val, y_val = make_dataset(n_samples=20000)
+
+    start = time.time()
+    best = select_model(
+        XGBClassifier(random_state=42),
+        X_train,
+        y_train,
+        X_val,
+        y_val,
+        time_budget=2,
+        n_candidates=3,
+        n_jobs=1,
+    )
+
+    assert time.time() - start < 2.5
+    assert best["trials"] >= 1
+    assert best["model"].best_iteration < 100000 - 1
+
+
+def test_selected_model_refits_without_eval_set():
+    X_train, y_train, X_val, y_val = make_dataset()
+
+    best = select_model(
+        XGBClassifier(random_state=42),
+        X_train,
+        y_train,
+        X_val,
+        y_val,
+        time_budget=60,
+        n_candidates=4,
+        n_jobs=2,
+    )
+    model = best["model"]
+
+    assert 0 < best["auprc"] <= 1
+    assert model.get_params()["early_stopping_rounds"] is None
+    assert model.get_params()["callbacks"] is None
+    model.fit(X_train, y_train)
+    assert model.predict_proba(X_val).shape == (len(X_val), 2)
+
+
+def test_cut_off_final_round_keeps_the_best_model(monkeypatch):
+    run_trial = model_selection._run_trial
+    rounds = {}
+
+    def cut_off_after_first_round(estimator, params, n_estimators, *args):
+        # Later rounds stop after one boosting round, as if the deadline hit
+        if n_estimators > model_selection.MIN_ESTIMATORS:
+            result = run_trial(estimator, params, 1, *args)
+        else:
+            result = run_trial(estimator, params, n_estimators, *args)
+        rounds.setdefault(n_estimators, []).append(result[0])
+        return result
+
+    monkeypatch.setattr(model_selection, "_run_trial", cut_off_after_first_round)
+    X_train, y_train, X_val, y_val = make_dataset()
+
+    best = select_model(
+        XGBClassifier(random_state=42),
+        X_train,
+        y_train,
+        X_val,
+        y_val,
+        time_budget=60,
+        n_candidates=9,
+        n_jobs=1,
+    )
+
+    last_round = rounds[max(rounds)]
+    assert len(rounds) > 1
+    assert max(last_round) < max(rounds[model_selection.MIN_ESTIMATORS])
+    assert best["auprc"] == max(max(scores) for scores in rounds.values())
+
+
+def test_calibrated_thresholds_meet_targets():
+    rng = np.random.default_rng(0)
+    y = (rng.random(5000) < 0.05).astype(int)
+    proba = np.clip(rng.normal(0.2 + 0.6 * y, 0.15), 0, 1)
+
+    t_low, t_high = calibrate_thresholds(y, proba)
+
+    assert t_low <= t_high
+    assert recall_score(y, proba >= t_low) >= model_selection.REVIEW_MIN_RECALL
+    assert precision_score(y, proba >= t_low) >= model_selection.REVIEW_MIN_PRECISION
+    assert precision_score(y, proba >= t_high) >= model_selection.BLOCK_MIN_PRECISION
@@ -0,0 +1,59 @@
+import threading
+import time
+from app.startup import build_warmup_frame
+from tests.helpers import StubModel, TRANSACTION, wait_until_ready
+
+
+def test_time_to_first_prediction(make_client):
+    start = time.perf_counter()
+    with make_client(lambda: (StubModel(), 0.0)) as client:
+        wait_until_ready(client)
+        ready_at = time.perf_counter()
+        response = client.post("/predict/", json=TRANSACTION)
+        first_prediction_at = time.perf_counter()
+        timings = client.get("/health/ready").json()["startup_timings"]
+
+    assert response.status_code == 200
+    assert response.json()["tier"] == "model"
+    assert set(timings) == {"imports", "model_load", "warmup", "total"}
+    assert first_prediction_at - ready_at < 1.0
+    assert first_prediction_at - start < 5.0
+
+
+def test_not_ready_while_model_loads(make_client):
+    loaded = threading.Event()
+
+    def slow_loader():
+        loaded.wait(timeout=10)
+        return StubModel(), 0.0
+
+    with make_client(slow_loader) as client:
+        assert client.get("/health/live").status_code == 200
+        assert client.get("/health/ready").status_code == 503
+        assert client.post("/predict/", json=TRANSACTION).status_code == 503
+
+        loaded.set()
+        wait_until_ready(client)
+        assert client.post("/predict/", json=TRANSACTION).status_code == 200
+
+
+def test_startup_failure_takes_liveness_down(make_client):
+    def broken_loader():
+        raise ValueError("columns are missing")
+
+    with make_client(broken_loader) as client:
+        deadline = time.perf_counter() + 5
+        while client.get("/health/live").status_code == 200:
+            assert time.perf_counter() < deadline
+            time.sleep(0.01)
+
+        live = client.get("/health/live")
+        assert live.status_code == 503
+        assert "columns are missing" in live.json()["detail"]
+        assert client.get("/health/ready").status_code == 503
+
+
+def test_warmup_frame_matches_request_columns():
+    df = build_warmup_frame()
+    assert list(df.columns) == list(TRANSACTION)
+    assert set(df["type"]) == {"PAYMENT", "TRANSFER", "CASH_OUT", "DEBIT", "CASH_IN"}